@@ -6,38 +6,115 @@ Fetches iCal data, processes recurring events, and generates calendar.json
 
 import os
 import sys
-import json
+import heapq
+import re
 import time
-import urllib.request
+from bisect import bisect_left
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timezone, timedelta
-import pytz
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from dateutil.rrule import rrulestr
 from icalendar import Calendar, Event
 from dotenv import load_dotenv
-import schedule
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 import logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)s | %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# Returned by _fetch_ical_data when the server answers 304 Not Modified
+NOT_MODIFIED = object()
+
+# Raw-text patterns used to pre-filter VEVENT blocks before full parsing
+VEVENT_BLOCK_RE = re.compile(rb'BEGIN:VEVENT\r?\n.*?END:VEVENT\r?\n?', re.DOTALL)
+DTSTART_DATE_RE = re.compile(rb'^DTSTART[^:\r\n]*:(\d{8})', re.MULTILINE)
+RECURRENCE_ID_DATE_RE = re.compile(rb'^RECURRENCE-ID[^:\r\n]*:(\d{8})', re.MULTILINE)
+RRULE_RE = re.compile(rb'^RRULE:([^\r\n]*)', re.MULTILINE)
+UNTIL_DATE_RE = re.compile(rb'UNTIL=(\d{8})')
+
+# Content-line patterns used by the fast VEVENT scanner
+UNFOLD_RE = re.compile(r'\r?\n[ \t]')
+CONTENT_LINE_RE = re.compile(r'([A-Za-z0-9-]+)((?:;[A-Za-z0-9-]+=(?:"[^"]*"|[^;:"])*)*):(.*)')
+PARAM_RE = re.compile(r';([A-Za-z0-9-]+)=("[^"]*"|[^;:"]*)')
+TEXT_ESCAPE_RE = re.compile(r'\\([\\;,nN])')
+UNTIL_VALUE_RE = re.compile(r'UNTIL=([0-9TZ]+)', re.IGNORECASE)
+
+# VEVENT properties read by the dashboard and for recurrence expansion
+VEVENT_TEXT_PROPERTIES = ('summary', 'description', 'location', 'uid')
+VEVENT_DATE_PROPERTIES = ('dtstart', 'dtend', 'recurrence-id')
+
+# Events are kept as (summary, start, end, description, location, calendar) tuples until output
+EVENT_START = itemgetter(1)
+
+@lru_cache(maxsize=256)
+def parse_rrule(rule, dtstart):
+    """Parse an RRULE value for a series start; cached since rules rarely change between refreshes.
+    
+    UNTIL is rewritten to match DTSTART, as dateutil rejects mixing
+    timezone-aware and naive values and feeds are not always consistent.
+    """
+    until = UNTIL_VALUE_RE.search(rule)
+    if until:
+        value = until.group(1).upper()
+        if dtstart.tzinfo is None:
+            value = value.rstrip('Z')
+        elif not value.endswith('Z'):
+            value = (value if 'T' in value else value + 'T235959') + 'Z'
+        rule = rule[:until.start(1)] + value + rule[until.end(1):]
+    return rrulestr(rule, dtstart=dtstart)
+
 class CalendarProcessor:
+    # Naive datetimes in feeds are treated as UTC
+    _UTC = timezone.utc
+    
     def __init__(self):
         load_dotenv()
         
         # Get timezone from environment variable
         timezone_name = os.getenv('TIMEZONE', 'Europe/London')
-        self.timezone = pytz.timezone(timezone_name)
+        self.timezone = ZoneInfo(timezone_name)
         logger.info(f"Using timezone: {timezone_name}")
         
         self.output_file = os.getenv('CALENDAR_JSON_PATH', './calendar.json')
+        
+        # calendar.json is minified unless pretty output is requested for debugging
+        self.json_options = orjson.OPT_INDENT_2 if os.getenv('CALENDAR_JSON_PRETTY') else 0
+        
         self.calendars = self._load_calendar_config()
         
+        # State below lives for the whole service so every refresh starts warm
+        self._session = self._create_session()
+        
+        # Per-calendar HTTP validators and the events parsed from that response,
+        # keyed by (name, url) since calendars may share a feed but tag events differently
+        self._cache = {}
+        
+        # Feeds are fetched concurrently; workers are reused across refreshes
+        self._executor = ThreadPoolExecutor(max_workers=min(8, max(1, len(self.calendars))))
+        
+    def close(self):
+        """Stop worker threads and close pooled HTTP connections."""
+        self._executor.shutdown()
+        self._session.close()
+    
+    def _create_session(self):
+        """Create a pooled HTTP session reused across fetches."""
+        session = requests.Session()
+        session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'kobo-dashboard-calendar-processor'
+        })
+        
+        # Keep one live connection per calendar so keep-alive spans refreshes
+        pool_size = max(1, len(self.calendars))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
     def _load_calendar_config(self):
         """Load calendar configuration from environment variables."""
         ical_urls = os.getenv('ICAL_URLS', '').split(',')
@@ -55,49 +132,318 @@ class CalendarProcessor:
         for i, url in enumerate(ical_urls):
             if url.strip() and i < len(calendar_names):
                 calendars.append({
-                    'name': calendar_names[i].strip(),
+                    'name': sys.intern(calendar_names[i].strip()),
                     'url': url.strip()
                 })
                 
         logger.info(f"Loaded {len(calendars)} calendar configurations")
         return calendars
     
-    def _fetch_ical_data(self, url):
-        """Fetch iCal data from URL."""
+    def _fetch_ical_data(self, url, today, cache_key):
+        """Fetch iCal data from URL, or NOT_MODIFIED if today's cached copy is current."""
         try:
             logger.info(f"Fetching iCal data from: {url}")
-            with urllib.request.urlopen(url) as response:
-                return response.read()
+            
+            # Only revalidate entries parsed for today; a new day needs a full body
+            headers = {}
+            cached = self._cache.get(cache_key)
+            if cached and cached['date'] == today:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
+            
+            response = self._session.get(url, headers=headers, timeout=30)
+            response.raise_for_status()
+            
+            if response.status_code == 304:
+                return NOT_MODIFIED
+            
+            self._cache[cache_key] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'date': None,
+                'events': []
+            }
+            return response.content
         except Exception as e:
             logger.error(f"Error fetching iCal from {url}: {e}")
             return None
     
+    @staticmethod
+    def _prefilter_vevents(ical_data, today):
+        """Drop VEVENT blocks from raw iCal data that cannot fall on today.
+        
+        Dates are compared on their raw YYYYMMDD form with a one-day margin,
+        since the timezone conversion done later can shift an event by a day.
+        Blocks whose dates cannot be read are kept.
+        """
+        earliest = (today - timedelta(days=1)).strftime('%Y%m%d').encode()
+        latest = (today + timedelta(days=1)).strftime('%Y%m%d').encode()
+        
+        def keep_or_drop(match):
+            block = match.group(0)
+            
+            dtstart = DTSTART_DATE_RE.search(block)
+            if not dtstart:
+                return block
+            start = dtstart.group(1)
+            if earliest <= start <= latest:
+                return block
+            
+            # Modified instances of recurring events
+            recurrence_id = RECURRENCE_ID_DATE_RE.search(block)
+            if recurrence_id and earliest <= recurrence_id.group(1) <= latest:
+                return block
+            
+            # Recurring events that started before today and have not ended
+            rrule = RRULE_RE.search(block)
+            if rrule and start <= latest:
+                until = UNTIL_DATE_RE.search(rrule.group(1))
+                if not until or until.group(1) >= earliest:
+                    return block
+            
+            return b''
+        
+        return VEVENT_BLOCK_RE.sub(keep_or_drop, ical_data)
+    
+    @staticmethod
+    def _parse_ical_date(value, params):
+        """Parse a DATE or DATE-TIME value, attaching its TZID if present."""
+        if params.get('VALUE') == 'DATE' or len(value) == 8:
+            return date.fromisoformat(value)
+        
+        dt = datetime.fromisoformat(value)
+        if dt.tzinfo is None and 'TZID' in params:
+            dt = dt.replace(tzinfo=ZoneInfo(params['TZID']))
+        return dt
+    
+    def _fast_parse_vevents(self, ical_data):
+        """Scan raw iCal data into flat VEVENT dicts without building a component tree.
+        
+        Only the properties the dashboard shows are read. Anything the scanner
+        cannot interpret raises, so the caller can fall back to icalendar.
+        """
+        text = UNFOLD_RE.sub('', ical_data.decode('utf-8'))
+        
+        vevents = []
+        vevent = None
+        nested = 0
+        
+        # Split on CRLF/LF only; str.splitlines would also break on separators inside values
+        for line in text.replace('\r\n', '\n').split('\n'):
+            if vevent is None:
+                if line.upper() == 'BEGIN:VEVENT':
+                    vevent = {}
+                continue
+            
+            match = CONTENT_LINE_RE.fullmatch(line)
+            if not match:
+                if not line:
+                    continue
+                raise ValueError(f"Unreadable content line: {line[:40]!r}")
+            name, param_text, value = match.groups()
+            name = name.lower()
+            
+            # Skip nested components such as VALARM
+            if name == 'begin':
+                nested += 1
+                continue
+            if name == 'end':
+                if nested:
+                    nested -= 1
+                else:
+                    vevents.append(vevent)
+                    vevent = None
+                continue
+            if nested:
+                continue
+            
+            if name in VEVENT_TEXT_PROPERTIES:
+                vevent[name] = TEXT_ESCAPE_RE.sub(
+                    lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value
+                )
+            elif name in VEVENT_DATE_PROPERTIES:
+                params = {k.upper(): v.strip('"') for k, v in PARAM_RE.findall(param_text)}
+                vevent[name] = self._parse_ical_date(value, params)
+            elif name == 'rrule':
+                vevent.setdefault('rrule', value)
+            elif name == 'exdate':
+                params = {k.upper(): v.strip('"') for k, v in PARAM_RE.findall(param_text)}
+                vevent.setdefault('exdate', []).extend(
+                    self._parse_ical_date(v, params) for v in value.split(',')
+                )
+        
+        return vevents
+    
+    def _icalendar_parse_vevents(self, ical_data):
+        """Parse iCal data with icalendar into the same flat VEVENT dicts."""
+        cal = Calendar.from_ical(ical_data)
+        
+        vevents = []
+        
+        # Process top-level VEVENT components without recursing into alarms/timezones
+        for component in cal.subcomponents:
+            if isinstance(component, Event):
+                get = component.get
+                vevent = {}
+                for name in VEVENT_DATE_PROPERTIES:
+                    prop = get(name)
+                    if prop:
+                        vevent[name] = prop.dt
+                # Text values stay as vText; they are only converted for today's events
+                for name in VEVENT_TEXT_PROPERTIES:
+                    prop = get(name)
+                    if prop is not None:
+                        vevent[name] = prop
+                
+                rrule = get('rrule')
+                if rrule:
+                    if isinstance(rrule, list):
+                        rrule = rrule[0]
+                    vevent['rrule'] = rrule.to_ical().decode()
+                exdates = get('exdate')
+                if exdates:
+                    if not isinstance(exdates, list):
+                        exdates = [exdates]
+                    vevent['exdate'] = [d.dt for exdate in exdates for d in exdate.dts]
+                vevents.append(vevent)
+        
+        return vevents
+    
+    def _expand_recurrences(self, vevents, day_start, day_end):
+        """Replace recurring VEVENTs with their occurrences inside [day_start, day_end).
+        
+        Occurrences listed in EXDATE, or overridden by a separate VEVENT
+        with the same UID and a matching RECURRENCE-ID, are skipped.
+        """
+        utc = self._UTC
+        midnight = datetime.min.time()
+        
+        def normalise(dt):
+            if isinstance(dt, datetime) and dt.tzinfo is None:
+                return dt.replace(tzinfo=utc)
+            return dt
+        
+        # Instances that were edited individually, keyed by series UID and original start
+        overridden = {
+            (vevent.get('uid'), normalise(vevent['recurrence-id']))
+            for vevent in vevents if vevent.get('recurrence-id')
+        }
+        
+        expanded = []
+        for vevent in vevents:
+            rrule = vevent.get('rrule')
+            dtstart = vevent.get('dtstart')
+            if not rrule or not dtstart or vevent.get('recurrence-id'):
+                expanded.append(vevent)
+                continue
+            
+            try:
+                # All-day series recur on floating local dates
+                all_day = not isinstance(dtstart, datetime)
+                if all_day:
+                    series_start = datetime.combine(dtstart, midnight)
+                    window_start = day_start.replace(tzinfo=None)
+                    window_end = day_end.replace(tzinfo=None)
+                else:
+                    series_start = normalise(dtstart)
+                    window_start, window_end = day_start, day_end
+                
+                dtend = vevent.get('dtend')
+                duration = normalise(dtend) - normalise(dtstart) if dtend else None
+                
+                occurrences = parse_rrule(rrule, series_start).between(window_start, window_end, inc=True)
+            except Exception as e:
+                logger.warning(f"Error expanding recurring event '{vevent.get('summary', '')}': {e}")
+                expanded.append(vevent)
+                continue
+            
+            exdates = {normalise(d) for d in vevent.get('exdate', ())}
+            uid = vevent.get('uid')
+            
+            for occurrence in occurrences:
+                # between() is inclusive; the day window is half-open
+                if occurrence >= window_end:
+                    continue
+                if all_day:
+                    occurrence = occurrence.date()
+                if occurrence in exdates or (uid, occurrence) in overridden:
+                    continue
+                
+                instance = dict(vevent, dtstart=occurrence)
+                if duration is not None:
+                    instance['dtend'] = occurrence + duration
+                expanded.append(instance)
+        
+        return expanded
+    
     def _parse_calendar_events(self, ical_data, calendar_name):
         """Parse iCal data and return today's events."""
         try:
-            cal = Calendar.from_ical(ical_data)
+            # Get today in configured timezone; bound locally for the event loop
+            tz = self.timezone
+            utc = self._UTC
+            today = datetime.now(tz).date()
+            midnight = datetime.min.time()
+            
+            # Today as a half-open [day_start, day_end) window of instants
+            day_start = datetime.combine(today, midnight, tzinfo=tz)
+            day_end = datetime.combine(today + timedelta(days=1), midnight, tzinfo=tz)
             
-            # Get today in configured timezone
-            today = datetime.now(self.timezone).date()
+            ical_data = self._prefilter_vevents(ical_data, today)
+            try:
+                vevents = self._fast_parse_vevents(ical_data)
+            except Exception as e:
+                logger.warning(f"Fast parser failed, falling back to icalendar ({calendar_name}): {e}")
+                vevents = self._icalendar_parse_vevents(ical_data)
             logger.info(f"Processing events for date: {today} ({calendar_name})")
             
+            total_components = len(vevents)
+            vevents = self._expand_recurrences(vevents, day_start, day_end)
+            
+            # Normalise start times to comparable instants; all-day events start at local midnight
+            starts = []
+            dated_vevents = []
+            for vevent in vevents:
+                dt = vevent.get('dtstart')
+                if not dt:
+                    continue
+                
+                if isinstance(dt, datetime):
+                    if dt.tzinfo is None:
+                        dt = dt.replace(tzinfo=utc)
+                    starts.append(dt)
+                else:
+                    starts.append(datetime.combine(dt, midnight, tzinfo=tz))
+                dated_vevents.append(vevent)
+            
+            # Feeds already ordered by start time can be sliced; otherwise check every event
+            if all(a <= b for a, b in zip(starts, starts[1:])):
+                lo = bisect_left(starts, day_start)
+                hi = bisect_left(starts, day_end, lo)
+                todays_vevents = dated_vevents[lo:hi]
+            else:
+                todays_vevents = [
+                    vevent for start, vevent in zip(starts, dated_vevents)
+                    if day_start <= start < day_end
+                ]
+            
             events = []
-            total_components = 0
             
-            # Process all VEVENT components
-            for component in cal.walk():
-                if component.name == "VEVENT":
-                    total_components += 1
-                    event = self._process_event(component, today, calendar_name)
-                    if event:
-                        events.append(event)
+            for vevent in todays_vevents:
+                event = self._process_event(vevent, calendar_name)
+                if event:
+                    events.append(event)
+            
+            # Keep each calendar's events ordered so calendars can be merged cheaply
+            events.sort(key=EVENT_START)
             
             logger.info(f"Processed {total_components} total events, found {len(events)} for today ({calendar_name})")
             
             # Log each found event
-            for event in events:
-                start_time = event['start']['dateTime']
-                logger.info(f"Event: '{event['summary']}' at {start_time} ({calendar_name})")
+            for summary, start_time, *_ in events:
+                logger.info(f"Event: '{summary}' at {start_time} ({calendar_name})")
             
             return events
             
@@ -105,111 +451,132 @@ class CalendarProcessor:
             logger.error(f"Error parsing calendar {calendar_name}: {e}")
             return []
     
-    def _process_event(self, event_component, target_date, calendar_name):
-        """Process a single VEVENT component."""
+    def _process_event(self, vevent, calendar_name):
+        """Process a single flat VEVENT dict already known to start today into an event tuple."""
         try:
-            # Get start date/time
-            dtstart = event_component.get('dtstart')
-            if not dtstart:
-                return None
-            
-            # Convert to date for comparison
-            event_date = self._get_event_date(dtstart.dt)
-            
-            # Check if event is on target date
-            if event_date != target_date:
-                return None
+            get = vevent.get
             
             # Extract event details
-            summary = str(event_component.get('summary', 'Untitled Event'))
+            summary = str(get('summary', 'Untitled Event'))
             
             # Format start and end times
-            start_iso = self._format_datetime(dtstart.dt)
+            dtstart = vevent['dtstart']
+            start_iso = self._format_datetime(dtstart)
             
-            dtend = event_component.get('dtend')
+            dtend = get('dtend')
             if dtend:
-                end_iso = self._format_datetime(dtend.dt)
+                end_iso = self._format_datetime(dtend)
             else:
                 # If no end time, assume 30 minutes duration
-                if hasattr(dtstart.dt, 'astimezone'):
-                    end_dt = dtstart.dt + timedelta(minutes=30)
+                if isinstance(dtstart, datetime):
+                    end_dt = dtstart + timedelta(minutes=30)
                     end_iso = self._format_datetime(end_dt)
                 else:
                     end_iso = start_iso
             
-            # Create event object compatible with existing frontend
-            return {
-                'summary': summary,
-                'start': {
-                    'dateTime': start_iso
-                },
-                'end': {
-                    'dateTime': end_iso
-                },
-                'description': str(event_component.get('description', '')),
-                'location': str(event_component.get('location', '')),
-                'calendarSource': calendar_name
-            }
+            return (
+                summary,
+                start_iso,
+                end_iso,
+                str(get('description', '')),
+                str(get('location', '')),
+                calendar_name
+            )
             
         except Exception as e:
             logger.warning(f"Error processing event: {e}")
             return None
     
-    def _get_event_date(self, dt):
-        """Get the date of an event, handling timezone conversion."""
-        if hasattr(dt, 'date'):
-            # It's a datetime object
-            if hasattr(dt, 'astimezone'):
-                # Convert to configured timezone
-                tz_dt = dt.astimezone(self.timezone)
-                return tz_dt.date()
-            else:
-                # Naive datetime, assume UTC
-                utc_dt = dt.replace(tzinfo=timezone.utc)
-                tz_dt = utc_dt.astimezone(self.timezone)
-                return tz_dt.date()
-        else:
-            # It's already a date object
-            return dt
-    
     def _format_datetime(self, dt):
         """Format datetime to ISO string in configured timezone."""
-        if hasattr(dt, 'astimezone'):
-            # It's a datetime object
+        if isinstance(dt, datetime):
+            # It's a datetime object; naive values are UTC
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=self._UTC)
             tz_dt = dt.astimezone(self.timezone)
             return tz_dt.isoformat()
         else:
             # It's a date object, assume start of day
-            tz_dt = self.timezone.localize(datetime.combine(dt, datetime.min.time()))
+            tz_dt = datetime.combine(dt, datetime.min.time(), tzinfo=self.timezone)
             return tz_dt.isoformat()
     
-    def process_calendars(self):
-        """Main function to process all calendars and generate JSON."""
+    def _fetch_and_parse(self, calendar):
+        """Fetch a single calendar and return today's events."""
+        url = calendar['url']
+        cache_key = (calendar['name'], url)
+        today = datetime.now(self.timezone).date()
+        
+        # Fetch iCal data
+        ical_data = self._fetch_ical_data(url, today, cache_key)
+        if ical_data is NOT_MODIFIED:
+            logger.info(f"Calendar unchanged, reusing cached events ({calendar['name']})")
+            return self._cache[cache_key]['events']
+        if not ical_data:
+            return []
+        
+        # Parse events
+        events = self._parse_calendar_events(ical_data, calendar['name'])
+        
+        # Remember the result so a 304 on the next refresh skips parsing
+        self._cache[cache_key]['date'] = today
+        self._cache[cache_key]['events'] = events
+        return events
+    
+    def process_calendars(self, return_events=False):
+        """Main function to process all calendars and generate JSON.
+        
+        With return_events=True the merged events are returned instead of
+        being written to the output file.
+        """
         logger.info("Starting calendar processing...")
         
-        all_events = []
+        per_cal_events = []
+        
+        futures = {
+            self._executor.submit(self._fetch_and_parse, calendar): calendar
+            for calendar in self.calendars
+        }
         
-        for calendar in self.calendars:
+        # Collect in config order so same-time events keep a stable calendar order
+        for future, calendar in futures.items():
             try:
-                # Fetch iCal data
-                ical_data = self._fetch_ical_data(calendar['url'])
-                if not ical_data:
-                    continue
-                
-                # Parse events
-                events = self._parse_calendar_events(ical_data, calendar['name'])
-                all_events.extend(events)
-                
+                per_cal_events.append(future.result())
             except Exception as e:
                 logger.error(f"Error processing calendar {calendar['name']}: {e}")
         
-        # Sort all events by start time
-        all_events.sort(key=lambda x: x['start']['dateTime'])
+        # Merge the already-sorted calendars by start time; ties keep calendar order,
+        # as heapq.merge is stable with respect to the order of its inputs
+        merged = heapq.merge(*per_cal_events, key=EVENT_START)
+        
+        # Create event objects compatible with existing frontend
+        all_events = [
+            {
+                'summary': summary,
+                'start': {
+                    'dateTime': start_iso
+                },
+                'end': {
+                    'dateTime': end_iso
+                },
+                'description': description,
+                'location': location,
+                'calendarSource': calendar_name
+            }
+            for summary, start_iso, end_iso, description, location, calendar_name in merged
+        ]
+        
+        if return_events:
+            return all_events
         
         # Write to JSON file
         try:
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(all_events, f, indent=2, ensure_ascii=False)
+            payload = orjson.dumps(all_events, option=self.json_options)
+            
+            # Write beside the target and swap it in so readers never see a partial file
+            tmp_file = self.output_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_file, self.output_file)
             
             logger.info(f"Successfully saved {len(all_events)} total events to {self.output_file}")
             
@@ -227,6 +594,15 @@ class CalendarProcessor:
 
 def main():
     """Main function to run the calendar processing service."""
+    # Set up logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s | %(levelname)s | %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    
     processor = CalendarProcessor()
     
     # Get interval from environment (default: 5 minutes)
@@ -236,22 +612,23 @@ def main():
     logger.info(f"Processing interval: {interval_minutes} minutes")
     logger.info(f"Output file: {processor.output_file}")
     
-    # Schedule the processing
-    schedule.every(interval_minutes).minutes.do(processor.process_calendars)
-    
     # Run once immediately
+    next_run = time.monotonic()
     processor.process_calendars()
     
-    # Keep running
+    # Keep running, sleeping until each deadline instead of polling
     logger.info("Service started. Press Ctrl+C to stop.")
     try:
         while True:
-            schedule.run_pending()
-            time.sleep(10)  # Check every 10 seconds
+            next_run += interval_minutes * 60
+            time.sleep(max(0, next_run - time.monotonic()))
+            processor.process_calendars()
     except KeyboardInterrupt:
         logger.info("Service stopped by user")
     except Exception as e:
         logger.error(f"Service error: {e}")
+    finally:
+        processor.close()
 
 if __name__ == '__main__':
     main()